@@ -4,21 +4,54 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import mmap
 import os
 from pathlib import Path
-import threading
-from typing import Iterable, List, Dict, Any, Optional
+import queue
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Dict, Any, Optional, Union
 import socket
+import struct
 import subprocess
 import sys
-from contextlib import contextmanager
+import tempfile
+import threading
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+
+# Each pooled OCR instance owns its own ORT sessions; split the cores between
+# them so pool_size * intra_op_threads stays close to the core count.
+OCR_POOL_SIZE = max(1, int(os.getenv("OCR_POOL_SIZE", "").strip() or 2))
+_ORT_INTRA_OP_THREADS = max(1, (os.cpu_count() or 1) // OCR_POOL_SIZE)
+# OpenMP reads these when its runtime is loaded, so set them before importing
+# cv2/onnxruntime. PASSIVE keeps idle OpenMP threads from spinning on cores
+# that other pool instances need.
+os.environ.setdefault("OMP_NUM_THREADS", str(_ORT_INTRA_OP_THREADS))
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
 
 import cv2
 import numpy as np
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.responses import JSONResponse
+import onnxruntime
+from onnxocr.inference_engine import create_session
 from onnxocr.onnx_paddleocr import ONNXPaddleOcr
+from onnxocr.predict_base import PredictBase
 import uvicorn
 
+# Make sure OpenCV uses its dispatched SIMD kernels, and keep its own thread
+# pool out of the way of ONNX Runtime's threads in the OCR pool.
+cv2.setUseOptimized(True)
+cv2.setNumThreads(1)
+
+try:
+    from turbojpeg import TJPF_BGR, TurboJPEG
+except ImportError:  # pragma: no cover - optional dependency
+    TurboJPEG = None
+
 
 @contextmanager
 def _suppress_stdout_stderr() -> Iterable[None]:
@@ -39,23 +72,192 @@ def _env_bool(key: str, default: bool) -> bool:
         return default
     return raw.strip().lower() in {"1", "true", "yes", "on"}
 
+def _env_int(key: str, default: int) -> int:
+    raw = os.getenv(key)
+    if raw is None or not raw.strip():
+        return default
+    return int(raw.strip())
+
+
+# Load the *.int8.onnx models written by scripts/quantize.py instead of FP32.
+OCR_QUANTIZED = _env_bool("OCR_QUANTIZED", False)
+
+
+def _model_path(model_dir: str) -> str:
+    if not OCR_QUANTIZED:
+        return model_dir
+    quantized = Path(model_dir).with_suffix(".int8.onnx")
+    if not quantized.exists():
+        raise FileNotFoundError(f"Quantized model not found: {quantized} (run scripts/quantize.py)")
+    return str(quantized)
+
+
+def _session_options() -> onnxruntime.SessionOptions:
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = _ORT_INTRA_OP_THREADS
+    # Parallelism comes from the pool; keep each session to a single op stream.
+    options.inter_op_num_threads = 1
+    options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Idle intra-op threads sleep instead of spinning on cores other instances need.
+    options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+    return options
+
+
+def _get_onnx_session(
+    self: PredictBase, model_dir: str, use_gpu: bool, gpu_id: int = 0
+) -> onnxruntime.InferenceSession:
+    """Replacement for PredictBase.get_onnx_session that applies our SessionOptions."""
+    # create_session keeps onnxocr's provider config (e.g. CUDA's
+    # cudnn_conv_algo_search) and its missing-model error.
+    return create_session(
+        _model_path(model_dir), use_gpu=use_gpu, gpu_id=gpu_id, sess_options=_session_options()
+    )
+
+
+# onnxocr builds its sessions with default SessionOptions, so hook the factory.
+PredictBase.get_onnx_session = _get_onnx_session
+
+
+class _NormalizeToCHW:
+    """Fused stand-in for onnxocr's NormalizeImage(order="hwc") + ToCHWImage.
+
+    Writes the normalized float32 CHW tensor in one output allocation instead
+    of astype / scale / subtract / divide / transpose temporaries.
+    """
+
+    def __init__(self, normalize: Any) -> None:
+        std = np.asarray(normalize.std, dtype=np.float32).reshape(-1)
+        mean = np.asarray(normalize.mean, dtype=np.float32).reshape(-1)
+        self.alpha = np.float32(normalize.scale) / std
+        self.beta = -mean / std
+
+    def __call__(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        img = data["image"]
+        h, w = img.shape[:2]
+        out = np.empty((3, h, w), dtype=np.float32)
+        for c in range(3):
+            np.multiply(img[:, :, c], self.alpha[c], out=out[c], dtype=np.float32)
+            out[c] += self.beta[c]
+        data["image"] = out
+        return data
+
+
+def _fuse_det_preprocess(engine: ONNXPaddleOcr) -> None:
+    """Swap the detector's NormalizeImage + ToCHWImage pair for _NormalizeToCHW."""
+    ops = getattr(getattr(engine, "text_detector", None), "preprocess_op", None)
+    if not ops:
+        return
+    names = [type(op).__name__ for op in ops]
+    for i in range(len(ops) - 1):
+        if (
+            names[i] == "NormalizeImage"
+            and names[i + 1] == "ToCHWImage"
+            and np.shape(ops[i].mean) == (1, 1, 3)  # order="hwc"
+        ):
+            ops[i : i + 2] = [_NormalizeToCHW(ops[i])]
+            return
+
+
+USE_GPU = _env_bool("USE_GPU", True)
+
+
 def _init_ocr() -> ONNXPaddleOcr:
-    """Create a single OCR instance to reuse across requests."""
+    """Create a single OCR instance and warm it up."""
     try:
-        use_gpu = _env_bool("USE_GPU", True)
         with _suppress_stdout_stderr():
-            return ONNXPaddleOcr(use_gpu=use_gpu, lang="english")
+            engine = ONNXPaddleOcr(use_gpu=USE_GPU, lang="english")
+            _fuse_det_preprocess(engine)
+            # Pay the first-run graph optimization / arena allocation at startup.
+            engine.ocr(np.zeros((64, 64, 3), dtype=np.uint8))
+            return engine
     except Exception as exc:  # pragma: no cover - only runs at startup
         raise RuntimeError("Failed to initialize ONNXPaddleOcr") from exc
 
 
-ocr = _init_ocr()
-_ocr_lock = threading.Lock()
-app = FastAPI(title="ONNX PaddleOCR API", version="1.0.0")
+def _init_ocr_pool(size: int) -> queue.SimpleQueue[ONNXPaddleOcr]:
+    """Pre-build ``size`` OCR instances so concurrent requests don't queue on one."""
+    # SimpleQueue is implemented in C: an uncontended get/put takes no
+    # Python-level lock, unlike queue.Queue's Condition-based methods.
+    pool: queue.SimpleQueue[ONNXPaddleOcr] = queue.SimpleQueue()
+    for _ in range(size):
+        pool.put(_init_ocr())
+    return pool
+
+
+# Built on first use rather than at import: the `python main.py` supervisor
+# imports this module too but never serves a request.
+_ocr_pool: Optional[queue.SimpleQueue[ONNXPaddleOcr]] = None
+_ocr_pool_lock = threading.Lock()
 
 
-def _format_results(raw: Iterable) -> List[Dict[str, Any]]:
-    """Convert PaddleOCR-style results into a JSON-serializable list."""
+def _get_ocr_pool() -> queue.SimpleQueue[ONNXPaddleOcr]:
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                _ocr_pool = _init_ocr_pool(OCR_POOL_SIZE)
+    return _ocr_pool
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build and warm the OCR pool before a serving process accepts requests.
+
+    The executor and batch semaphore live on ``app.state`` so each lifespan
+    (and event loop) gets fresh ones.
+    """
+    _get_ocr_pool()
+    # Sized to the pool so executor threads never wait on a free OCR instance.
+    app.state.ocr_executor = ThreadPoolExecutor(max_workers=OCR_POOL_SIZE, thread_name_prefix="ocr")
+    # OCR jobs /ocr/batch may queue on the executor at once.
+    app.state.batch_slots = asyncio.Semaphore(OCR_POOL_SIZE * 2)
+    try:
+        yield
+    finally:
+        app.state.ocr_executor.shutdown(wait=False)
+
+
+# Files accepted per /ocr/batch request.
+OCR_MAX_BATCH = max(1, _env_int("OCR_MAX_BATCH", 64))
+app = FastAPI(
+    title="ONNX PaddleOCR API",
+    version="1.0.0",
+    lifespan=_lifespan,
+)
+
+# LRU of formatted results keyed by a hash of the uploaded bytes (0 disables).
+OCR_CACHE_SIZE = max(0, _env_int("OCR_CACHE_SIZE", 256))
+_ocr_cache: OrderedDict[bytes, List[Dict[str, Any]]] = OrderedDict()
+_ocr_cache_lock = threading.Lock()
+
+
+def _init_turbojpeg() -> Optional[TurboJPEG]:
+    """Return a TurboJPEG decoder, or None when libturbojpeg is unavailable."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except (OSError, RuntimeError):  # pragma: no cover - shared library missing
+        return None
+
+
+# Uploads whose header declares more pixels than this are rejected undecoded.
+OCR_MAX_PIXELS = _env_int("OCR_MAX_PIXELS", 50_000_000)
+# Longest side handed to the OCR models; larger images are shrunk first.
+OCR_MAX_DIM = max(1, _env_int("OCR_MAX_DIM", 1600))
+
+_U8 = np.dtype(np.uint8)
+
+_tj = _init_turbojpeg()
+_decode_buffers = threading.local()
+
+
+def _format_results(raw: Iterable, scale: float = 1.0) -> List[Dict[str, Any]]:
+    """Convert PaddleOCR-style results into a JSON-serializable list.
+
+    ``scale`` maps box coordinates back to the original image size.
+    """
     formatted: List[Dict[str, Any]] = []
     for detections in raw:
         for box, (text, score) in detections:
@@ -63,12 +265,21 @@ def _format_results(raw: Iterable) -> List[Dict[str, Any]]:
                 {
                     "text": text,
                     "score": float(score),
-                    "box": [[float(x), float(y)] for x, y in box],
+                    "box": (np.asarray(box, dtype=np.float64) * scale).tolist(),
                 }
             )
     return formatted
 
 
+class ImageError(ValueError):
+    """Upload that can't be OCR'd; ``code`` is a stable identifier for clients."""
+
+    def __init__(self, code: str, message: str, status_code: int = 400) -> None:
+        super().__init__(message)
+        self.code = code
+        self.status_code = status_code
+
+
 def run_ocr_from_path(image_path: Path) -> List[Dict[str, Any]]:
     """Run OCR given an image path."""
     if not image_path.exists():
@@ -79,19 +290,157 @@ def run_ocr_from_path(image_path: Path) -> List[Dict[str, Any]]:
 
 
 def run_ocr_from_bytes(image_bytes: bytes) -> List[Dict[str, Any]]:
-    """Decode raw image bytes and run OCR."""
+    """Decode raw image bytes and run OCR, reusing cached results for repeats."""
     if not image_bytes:
-        raise ValueError("Empty image data")
-
-    img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        raise ImageError("empty_image", "Empty image data")
+    fmt, width, height = _sniff_image(image_bytes)
+    if width * height > OCR_MAX_PIXELS:
+        raise ImageError("image_too_large", "Image too large")
+    if OCR_CACHE_SIZE == 0:
+        return _run_ocr(image_bytes, fmt)
+
+    key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    with _ocr_cache_lock:
+        cached = _ocr_cache.get(key)
+        if cached is not None:
+            _ocr_cache.move_to_end(key)
+            return cached
+
+    detections = _run_ocr(image_bytes, fmt)
+    with _ocr_cache_lock:
+        _ocr_cache[key] = detections
+        _ocr_cache.move_to_end(key)
+        while len(_ocr_cache) > OCR_CACHE_SIZE:
+            _ocr_cache.popitem(last=False)
+    return detections
+
+
+# DIB header sizes of the BMP variants (BITMAPCOREHEADER ... BITMAPV5HEADER).
+_BMP_DIB_SIZES = frozenset({12, 16, 40, 52, 56, 64, 108, 124})
+
+
+def _sniff_image(data: bytes) -> tuple[str, int, int]:
+    """Return ``(format, width, height)`` read from the file header, without decoding.
+
+    Width and height are 0 when the header doesn't give them up cheaply;
+    unrecognised signatures come back as ``("unknown", 0, 0)``.
+    """
+    head = bytes(data[:30])
+    try:
+        if head[:3] == b"\xff\xd8\xff":
+            pos = 2
+            while pos + 9 <= len(data) and data[pos] == 0xFF:
+                marker = data[pos + 1]
+                if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):  # SOFn
+                    height, width = struct.unpack_from(">HH", data, pos + 5)
+                    return "jpeg", width, height
+                if marker == 0xDA:
+                    break
+                pos += 2 + struct.unpack_from(">H", data, pos + 2)[0]
+            return "jpeg", 0, 0
+        if head[:8] == b"\x89PNG\r\n\x1a\n":
+            width, height = struct.unpack_from(">II", head, 16)
+            if head[12:16] != b"IHDR" or not (width and height):
+                raise ImageError("decode_failed", "Failed to decode image")
+            return "png", width, height
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack_from("<HH", head, 26)
+                return "webp", width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                bits = struct.unpack_from("<I", head, 21)[0]
+                return "webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                return "webp", int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+        if head[:2] == b"BM":
+            # BITMAPCOREHEADER (12 bytes) stores 16-bit sizes, later headers 32-bit.
+            dib_size = struct.unpack_from("<I", head, 14)[0]
+            if dib_size == 12:
+                width, height = struct.unpack_from("<HH", head, 18)
+            else:
+                width, height = struct.unpack_from("<ii", head, 18)
+            if dib_size not in _BMP_DIB_SIZES or not (width and height):
+                raise ImageError("decode_failed", "Failed to decode image")
+            return "bmp", abs(width), abs(height)
+        if head[:4] in (b"II*\x00", b"MM\x00*"):
+            return "tiff", 0, 0
+    except struct.error:
+        raise ImageError("decode_failed", "Failed to decode image") from None
+    # Anything else (GIF, PPM, JPEG 2000, ...) is left for cv2.imdecode to judge.
+    return "unknown", 0, 0
+
+
+def _thread_local_buf(width: int, height: int) -> np.ndarray:
+    """Reuse one BGR output buffer per thread while the image size stays the same."""
+    buf = getattr(_decode_buffers, "bgr", None)
+    if buf is None or buf.shape != (height, width, 3):
+        buf = np.empty((height, width, 3), dtype=np.uint8)
+        _decode_buffers.bgr = buf
+    return buf
+
+
+def _jpeg_exif_orientation(data: bytes) -> int:
+    """Return the EXIF orientation of a JPEG (1 when absent)."""
+    pos = 2
+    while pos + 4 <= len(data) and data[pos] == 0xFF:
+        marker = data[pos + 1]
+        if marker == 0xDA:  # start of scan: no metadata past this point
+            break
+        if marker == 0xE1 and data[pos + 4 : pos + 10] == b"Exif\0\0":
+            tiff = pos + 10
+            order = "little" if data[tiff : tiff + 2] == b"II" else "big"
+            ifd = tiff + int.from_bytes(data[tiff + 4 : tiff + 8], order)
+            for i in range(int.from_bytes(data[ifd : ifd + 2], order)):
+                entry = ifd + 2 + 12 * i
+                if int.from_bytes(data[entry : entry + 2], order) == 0x0112:
+                    return int.from_bytes(data[entry + 8 : entry + 10], order)
+            return 1
+        pos += 2 + int.from_bytes(data[pos + 2 : pos + 4], "big")
+    return 1
+
+
+def _decode_image(image_bytes: bytes, fmt: str) -> np.ndarray:
+    """Decode to a BGR array, using libjpeg-turbo for JPEGs when available."""
+    # cv2.imdecode applies EXIF rotation and TurboJPEG does not, so rotated
+    # photos stay on the OpenCV path to keep results identical.
+    if _tj is not None and fmt == "jpeg" and _jpeg_exif_orientation(image_bytes) == 1:
+        try:
+            header = _tj.decode_header(image_bytes)
+            width, height = header[0], header[1]
+            return _tj.decode(image_bytes, pixel_format=TJPF_BGR, dst=_thread_local_buf(width, height))
+        except (OSError, ValueError):
+            pass  # let OpenCV have a go (e.g. CMYK or truncated JPEGs)
+
+    img = cv2.imdecode(np.frombuffer(image_bytes, dtype=_U8), cv2.IMREAD_COLOR)
     if img is None:
-        raise ValueError("Failed to decode image")
+        raise ImageError("decode_failed", "Failed to decode image")
+    return img
+
 
-    with _ocr_lock:
-        raw = ocr.ocr(img)
-    return _format_results(raw)
+def _downscale(img: np.ndarray) -> tuple[np.ndarray, float]:
+    """Shrink ``img`` to OCR_MAX_DIM; return it with the factor back to full size."""
+    h, w = img.shape[:2]
+    longest = max(h, w)
+    if longest <= OCR_MAX_DIM:
+        return img, 1.0
+    s = OCR_MAX_DIM / longest
+    resized = cv2.resize(img, (max(1, int(w * s)), max(1, int(h * s))), interpolation=cv2.INTER_AREA)
+    return resized, longest / OCR_MAX_DIM
 
 
+def _run_ocr(image_bytes: bytes, fmt: str) -> List[Dict[str, Any]]:
+    img, scale = _downscale(_decode_image(image_bytes, fmt))
+    pool = _get_ocr_pool()
+    engine = pool.get()
+    try:
+        raw = engine.ocr(img)
+    finally:
+        pool.put(engine)
+    return _format_results(raw, scale)
+
+
+@functools.lru_cache(maxsize=1)
 def _is_wsl() -> bool:
     if os.getenv("WSL_DISTRO_NAME"):
         return True
@@ -102,6 +451,7 @@ def _is_wsl() -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def _windows_host_ip() -> Optional[str]:
     """Retrieve the Windows host LAN IP when running under WSL."""
     try:
@@ -116,12 +466,13 @@ def _windows_host_ip() -> Optional[str]:
             "}"
         )
         completed = subprocess.run(
-            ["powershell.exe", "-NoProfile", "-Command", powershell_cmd],
+            ["powershell.exe", "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", powershell_cmd],
             check=False,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
+            timeout=2.0,
         )
-    except FileNotFoundError:
+    except (FileNotFoundError, subprocess.TimeoutExpired):
         completed = None
 
     if completed and completed.stdout:
@@ -144,6 +495,7 @@ def _windows_host_ip() -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def _preferred_ip() -> str:
     """Return the IP address we recommend for accessing FastAPI."""
     try:
@@ -167,6 +519,16 @@ def _preferred_ip() -> str:
     return "127.0.0.1"
 
 
+def _opencv_cpu_features() -> str:
+    """Summarize OpenCV's baseline and dispatched SIMD levels from its build info."""
+    found = []
+    for line in cv2.getBuildInformation().splitlines():
+        line = line.strip()
+        if line.startswith(("Baseline:", "Dispatched code generation:")):
+            found.append(" ".join(line.split()))
+    return "; ".join(found) or "unknown"
+
+
 def _print_access_tips(port: int) -> None:
     ip_address: Optional[str] = None
     if _is_wsl():
@@ -178,6 +540,79 @@ def _print_access_tips(port: int) -> None:
 
 
 
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_upload(file: UploadFile) -> Union[bytes, bytearray]:
+    """Read an upload into a single preallocated buffer when its size is known."""
+    length = getattr(file, "size", None)
+    if length is None:
+        header = file.headers.get("content-length", "")
+        length = int(header) if header.isdigit() else None
+    if not length:
+        return await file.read()
+
+    buf = bytearray(length)
+    pos = 0
+    while pos < length:
+        chunk = await file.read(min(_UPLOAD_CHUNK_SIZE, length - pos))
+        if not chunk:
+            del buf[pos:]
+            break
+        buf[pos : pos + len(chunk)] = chunk
+        pos += len(chunk)
+    return buf
+
+
+@contextmanager
+def _zero_copy_bytes(upload: UploadFile) -> Iterator[Optional[memoryview]]:
+    """Expose the upload's spooled data without copying it out.
+
+    In-memory spools yield the BytesIO buffer, spooled-to-disk uploads an mmap
+    of the temp file. Yields None when the upload isn't a SpooledTemporaryFile.
+    The view is released on exit, before FastAPI closes the upload.
+    """
+    spooled = upload.file
+    if not isinstance(spooled, tempfile.SpooledTemporaryFile):
+        yield None
+        return
+    if not spooled._rolled:
+        view = spooled._file.getbuffer()
+        try:
+            yield view
+        finally:
+            view.release()
+        return
+    if os.fstat(spooled.fileno()).st_size == 0:
+        yield memoryview(b"")
+        return
+    with mmap.mmap(spooled.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+async def _run_in_executor(executor: ThreadPoolExecutor, fn: Callable[..., Any], *args: Any) -> Any:
+    """``loop.run_in_executor`` that doesn't return before the worker finishes.
+
+    Arguments may be views from _zero_copy_bytes, which are released as soon
+    as the caller leaves its ``with`` block. On cancellation, wait for the
+    worker thread to finish with the view before the CancelledError goes up.
+    """
+    future = asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            try:
+                await asyncio.wait({future})
+            except asyncio.CancelledError:
+                pass
+        raise
+
+
 @app.get("/")
 def root() -> Dict[str, str]:
     return {"service": "onnx-ocr-api", "docs": "/docs", "healthz": "/healthz"}
@@ -188,26 +623,94 @@ def healthz() -> Dict[str, str]:
     return {"status": "ok"}
 
 
-@app.post("/ocr")
-def ocr_endpoint(file: UploadFile = File(...)) -> Dict[str, Any]:
+class OCRError(Exception):
+    """Request failure returned to clients as ``{"detail": ..., "code": ...}``."""
+
+    def __init__(self, status_code: int, code: str, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.code = code
+        self.detail = detail
+
+
+@app.exception_handler(OCRError)
+async def _ocr_error_handler(request: Request, exc: OCRError) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail, "code": exc.code})
+
+
+# Bodies outside these bounds are rejected before any decode work.
+MIN_IMAGE_BYTES = 128
+MAX_IMAGE_BYTES = _env_int("MAX_IMAGE_BYTES", 20_000_000)
+
+
+def _check_image_size(data: Union[bytes, bytearray]) -> None:
+    if len(data) < MIN_IMAGE_BYTES:
+        raise ImageError("image_too_small", "Image too small")
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ImageError("upload_too_large", "Upload too large", status_code=413)
+
+
+def _check_content_type(file: UploadFile) -> None:
     if file.content_type and not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="Only image uploads are supported.")
+        raise OCRError(400, "unsupported_media_type", "Only image uploads are supported.")
 
-    data = file.file.read()
-    try:
-        detections = run_ocr_from_bytes(data)
-    except HTTPException:
-        raise
-    except FileNotFoundError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"OCR failed: {exc}") from exc
+
+@app.post("/ocr")
+async def ocr_endpoint(request: Request, file: UploadFile = File(...)) -> Dict[str, Any]:
+    _check_content_type(file)
+    executor = request.app.state.ocr_executor
+    # The view must outlive the OCR job, so the with block wraps the error mapping.
+    with _zero_copy_bytes(file) as view:
+        try:
+            data = view if view is not None else await _read_upload(file)
+            _check_image_size(data)
+            detections = await _run_in_executor(executor, run_ocr_from_bytes, data)
+        except ImageError as exc:
+            raise OCRError(exc.status_code, exc.code, str(exc)) from exc
+        except ValueError as exc:
+            raise OCRError(400, "invalid_image", str(exc)) from exc
+        except Exception as exc:
+            raise OCRError(500, "ocr_failed", f"OCR failed: {exc}") from exc
 
     return {"detections": detections}
 
 
+@app.post("/ocr/batch")
+async def ocr_batch_endpoint(request: Request, files: List[UploadFile] = File(...)) -> Dict[str, Any]:
+    if len(files) > OCR_MAX_BATCH:
+        raise OCRError(400, "too_many_files", f"Too many files (max {OCR_MAX_BATCH}).")
+    for file in files:
+        _check_content_type(file)
+
+    executor = request.app.state.ocr_executor
+    batch_slots = request.app.state.batch_slots
+
+    async def _run(data: Union[bytes, bytearray, memoryview]) -> List[Dict[str, Any]]:
+        _check_image_size(data)
+        async with batch_slots:
+            return await _run_in_executor(executor, run_ocr_from_bytes, data)
+
+    with ExitStack() as stack:
+        views = [stack.enter_context(_zero_copy_bytes(file)) for file in files]
+        blobs = await asyncio.gather(
+            *(_read_upload(file) for file, view in zip(files, views) if view is None)
+        )
+        read = iter(blobs)
+        data_list = [view if view is not None else next(read) for view in views]
+        outcomes = await asyncio.gather(*(_run(data) for data in data_list), return_exceptions=True)
+    results: List[Dict[str, Any]] = []
+    for file, outcome in zip(files, outcomes):
+        # A bad image only fails its own entry; anything else fails the batch.
+        if isinstance(outcome, ValueError):
+            code = outcome.code if isinstance(outcome, ImageError) else "invalid_image"
+            results.append({"file": file.filename, "error": str(outcome), "code": code})
+        elif isinstance(outcome, BaseException):
+            raise OCRError(500, "ocr_failed", f"OCR failed: {outcome}") from outcome
+        else:
+            results.append({"file": file.filename, "detections": outcome})
+    return {"results": results}
+
+
 def sample(image_path: Path = Path("sample.png")) -> None:
     """Run the local sample (mirrors the request style in the prompt)."""
     for item in run_ocr_from_path(image_path):
@@ -219,14 +722,25 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", "8000"))
     reload_enabled = _env_bool("RELOAD", False)
     log_level = os.getenv("LOG_LEVEL", "warning")
+    print(f"OpenCV CPU 最適化: {_opencv_cpu_features()} (useOptimized={cv2.useOptimized()})")
     if host == "0.0.0.0":
         _print_access_tips(port)
     else:
         print(f"FastAPI を http://{host}:{port} で待ち受けます。")
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=reload_enabled,
-        log_level=log_level,
-    )
+    if reload_enabled:
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            reload=True,
+            log_level=log_level,
+        )
+    else:
+        # Each prefork worker builds its own OCR pool, so workers don't share a GIL.
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            workers=_env_int("WORKERS", 0) or None,
+            log_level=log_level,
+        )
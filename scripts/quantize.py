@@ -0,0 +1,127 @@
+"""Build int8 copies of the onnxocr det/rec/cls models with ORT static quantization.
+
+Calibration inputs are captured from onnxocr's own pipeline while it runs over
+a folder of sample images, so every model sees exactly the tensors it gets in
+production. Each model is written next to the original as ``*.int8.onnx``;
+start the API with ``OCR_QUANTIZED=true`` to load them. Requires the ``onnx``
+package in addition to the API's requirements.
+
+    python scripts/quantize.py ./calibration_images --limit 200
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+import cv2
+import numpy as np
+from onnxocr.onnx_paddleocr import ONNXPaddleOcr
+from onnxocr.predict_base import PredictBase
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp", ".tif", ".tiff"}
+
+
+class _Recorder:
+    """Collects the input feeds of whichever model is currently being calibrated."""
+
+    def __init__(self) -> None:
+        self.models: List[str] = []
+        self.target: Optional[str] = None
+        self.feeds: List[Dict[str, np.ndarray]] = []
+
+
+class _RecordingSession:
+    """Wraps an InferenceSession and copies its inputs into the recorder."""
+
+    def __init__(self, session: Any, model_dir: str, recorder: _Recorder) -> None:
+        self._session = session
+        self._model_dir = model_dir
+        self._recorder = recorder
+
+    def run(self, output_names: Any, input_feed: Dict[str, np.ndarray], *args: Any, **kwargs: Any) -> Any:
+        if self._recorder.target == self._model_dir:
+            self._recorder.feeds.append({k: np.array(v, copy=True) for k, v in input_feed.items()})
+        return self._session.run(output_names, input_feed, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+class _OcrFeedReader(CalibrationDataReader):
+    """Runs OCR image by image and hands out the feeds recorded for one model."""
+
+    def __init__(self, engine: ONNXPaddleOcr, recorder: _Recorder, images: List[Path], max_dim: int) -> None:
+        self._engine = engine
+        self._recorder = recorder
+        self._images: Iterator[Path] = iter(images)
+        self._max_dim = max_dim
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        while not self._recorder.feeds:
+            path = next(self._images, None)
+            if path is None:
+                return None
+            img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if img is None:
+                continue
+            # Same OCR_MAX_DIM downscale the API applies before inference.
+            h, w = img.shape[:2]
+            if max(h, w) > self._max_dim:
+                s = self._max_dim / max(h, w)
+                img = cv2.resize(img, (max(1, int(w * s)), max(1, int(h * s))), interpolation=cv2.INTER_AREA)
+            self._engine.ocr(img)
+        return self._recorder.feeds.pop(0)
+
+
+def _build_engine(recorder: _Recorder) -> ONNXPaddleOcr:
+    original = PredictBase.get_onnx_session
+
+    def recording(self: PredictBase, model_dir: str, *args: Any, **kwargs: Any) -> Any:
+        recorder.models.append(model_dir)
+        return _RecordingSession(original(self, model_dir, *args, **kwargs), model_dir, recorder)
+
+    PredictBase.get_onnx_session = recording
+    try:
+        return ONNXPaddleOcr(use_gpu=False, lang="english")
+    finally:
+        PredictBase.get_onnx_session = original
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("images", type=Path, help="folder of calibration images")
+    parser.add_argument("--limit", type=int, default=200, help="max calibration images (default: 200)")
+    parser.add_argument(
+        "--max-dim", type=int, default=1600, help="downscale images like the API's OCR_MAX_DIM (default: 1600)"
+    )
+    args = parser.parse_args(argv)
+
+    images = sorted(p for p in args.images.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)[: args.limit]
+    if not images:
+        print(f"No images found under {args.images}", file=sys.stderr)
+        return 1
+
+    recorder = _Recorder()
+    engine = _build_engine(recorder)
+    for model_dir in recorder.models:
+        output = Path(model_dir).with_suffix(".int8.onnx")
+        print(f"{model_dir} -> {output} ({len(images)} calibration images)")
+        recorder.target = model_dir
+        recorder.feeds.clear()
+        quantize_static(
+            model_dir,
+            str(output),
+            _OcrFeedReader(engine, recorder, images, args.max_dim),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())